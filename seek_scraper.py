@@ -1,11 +1,17 @@
 # seek_scraper.py
-from playwright.sync_api import sync_playwright
-import pandas as pd
+from playwright.async_api import async_playwright
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+import asyncio
+import csv
+import functools
+import math
 import time
 import re
 import os
-from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 
 
 # ============================
@@ -28,9 +34,71 @@ def env_bool(name: str, default: bool) -> bool:
     return str(v).strip().lower() in ("1", "true", "yes", "y")
 
 
+# ============================
+# Config (read once at startup)
+# ============================
+DEFAULT_UA = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    keyword: str
+    min_salary: int
+    listing_date: int
+    csv_path: str
+    headless: bool | None  # None = unset, resolve_headless() decides
+    slow_mo: float
+    ci: bool
+    has_display: bool
+    ua: str
+    tz: str
+    user_data_dir: str
+    use_api: bool
+    block_media: bool
+    block_trackers: bool
+    block_detail_extras: bool
+    block_detail_js: bool
+    tab_pool: int
+    http_concurrency: int
+    list_concurrency: int
+
+@functools.cache
+def load_cfg() -> Config:
+    """Snapshot every env setting once; later reads are plain attribute lookups."""
+    return Config(
+        keyword=env_str("KEYWORD", "Senior Insight Analyst"),
+        min_salary=env_int("MIN_SALARY", 150000),
+        listing_date=env_int("LISTING_DATE", 1),
+        csv_path=env_str("CSV_PATH", "seek_jobs_24h.csv"),
+        headless=env_bool("HEADLESS", True) if os.getenv("HEADLESS") not in (None, "") else None,
+        slow_mo=float(env_str("SLOW_MO", "0")),
+        ci=env_bool("CI", False),
+        has_display=os.getenv("DISPLAY") not in (None, ""),
+        ua=env_str("UA", DEFAULT_UA),
+        tz=env_str("TZ", "Australia/Brisbane"),
+        user_data_dir=env_str("PW_USER_DATA", ""),
+        use_api=env_bool("USE_API", True),
+        block_media=env_bool("BLOCK_MEDIA", True),
+        block_trackers=env_bool("BLOCK_TRACKERS", True),
+        block_detail_extras=env_bool("BLOCK_DETAIL_EXTRAS", True),
+        block_detail_js=env_bool("BLOCK_DETAIL_JS", False),
+        tab_pool=max(1, env_int("TAB_POOL", 8)),
+        http_concurrency=max(1, env_int("HTTP_CONCURRENCY", 20)),
+        list_concurrency=max(1, env_int("LIST_CONCURRENCY", 4)),
+    )
+
+
 # ============================
 # URL & parsing helpers
 # ============================
+SEEK_BASE = "https://www.seek.com.au"
+
+_RE_WS = re.compile(r"\s+")
+_RE_JOB_ID = re.compile(r"/job/(\d+)")
+_RE_PAGE_PARAM = re.compile(r"([?&])page=\d*")
+_RE_PAGE_LABEL = re.compile(r"\bpage[-\s]?(\d+)\b", re.I)
+# Whitespace and the quotes around CSS ::before content, trimmed in one call
+_LABEL_STRIP_CHARS = ' \t\r\n"'
+
 def build_seek_url(keyword: str, min_salary: int = 150000, listing_date: int = 1) -> str:
     """
     Build Seek search URL.
@@ -38,55 +106,261 @@ def build_seek_url(keyword: str, min_salary: int = 150000, listing_date: int = 1
       0 = any time, 1 = last 24 hours, 3 = last 3 days, etc.
     We also sort by 'ListedDate' for consistency.
     """
-    base = "https://www.seek.com.au"
-    keyword_slug = re.sub(r"\s+", "-", keyword.strip()).lower()
+    keyword_slug = _RE_WS.sub("-", keyword.strip()).lower()
     query = f"{keyword_slug}-jobs/in-All-Australia"
     filters = f"?salaryrange={min_salary}-999999&daterange={listing_date}&sortmode=ListedDate"
-    return f"{base}/{query}{filters}"
+    return f"{SEEK_BASE}/{query}{filters}"
 
-def set_query_param(url: str, key: str, value: str) -> str:
-    u = urlparse(url)
-    q = parse_qs(u.query)
-    q[key] = [value]
-    new_query = urlencode(q, doseq=True)
-    return urlunparse((u.scheme, u.netloc, u.path, u.params, new_query, u.fragment))
+def set_query_param_page(url: str, n: int) -> str:
+    """Set/replace the `page` query param with a targeted string edit (keeps param order)."""
+    new_url, count = _RE_PAGE_PARAM.subn(lambda m: f"{m.group(1)}page={n}", url, count=1)
+    if count:
+        return new_url
+    sep = "&" if "?" in url else "?"
+    return f"{url}{sep}page={n}"
 
+@functools.lru_cache(maxsize=4096)
 def extract_job_id_from_url(url: str):
-    m = re.search(r"/job/(\d+)", url or "")
+    if not url:
+        return None
+    # str.find jumps straight to the path segment; the regex only checks the digits
+    i = url.find("/job/")
+    if i < 0:
+        return None
+    m = _RE_JOB_ID.match(url, i) or _RE_JOB_ID.search(url, i + 1)
     return m.group(1) if m else None
 
+@functools.lru_cache(maxsize=1024)
 def posted_text_to_hours(txt: str) -> float:
     """
-    Convert Seek's posted-time text to hours.
+    Convert Seek's posted-time text to hours (cached: labels repeat a lot).
     Handles: 'Just posted', 'Today', '10h ago', '1d ago',
              'Posted 12 hours ago', 'Posted 1 day ago', '30+ days ago'
     """
     if not txt:
         return float("inf")
-    t = txt.strip().strip('"').lower()
-
+    t = txt.strip(_LABEL_STRIP_CHARS).lower()
     if "just" in t or "today" in t:
         return 0.0
+    if "30+" in t or "month" in t or "week" in t:
+        return float("inf")
 
-    m = re.search(r"(\d+)\s*(h|hour)", t)
-    if m:
-        return float(m.group(1))
+    # Single left-to-right scan, no regex: a digit run, optional whitespace,
+    # then the unit letter ("10h", "12 hours", "1 day"). Other units are too old.
+    n = len(t)
+    i = 0
+    while i < n:
+        if "0" <= t[i] <= "9":
+            j = i + 1
+            while j < n and "0" <= t[j] <= "9":
+                j += 1
+            k = j
+            while k < n and t[k].isspace():
+                k += 1
+            unit = t[k:k + 1]
+            if unit == "h":
+                return float(t[i:j])
+            if unit == "d":
+                return float(t[i:j]) * 24.0
+            i = j
+        else:
+            i += 1
+    return float("inf")
 
-    m = re.search(r"(\d+)\s*(d|day)", t)
-    if m:
-        return float(m.group(1)) * 24.0
 
-    m = re.search(r"posted\s+(\d+)\s+hour", t)
-    if m:
-        return float(m.group(1))
-    m = re.search(r"posted\s+(\d+)\s+day", t)
-    if m:
-        return float(m.group(1)) * 24.0
+# ============================
+# Seek search API (JSON behind the results page)
+# ============================
+SEEK_API_URL = f"{SEEK_BASE}/api/chalice-search/v4/search"
+
+def build_seek_api_params(keyword: str, min_salary: int = 150000, listing_date: int = 1, page: int = 1) -> dict:
+    """Query for the same search as build_seek_url(), one results page at a time."""
+    return {
+        "siteKey": "AU-Main",
+        "sourcesystem": "houston",
+        "where": "All Australia",
+        "keywords": keyword.strip(),
+        "salarytype": "annual",
+        "salaryrange": f"{min_salary}-999999",
+        "daterange": listing_date,
+        "sortmode": "ListedDate",
+        "page": page,
+    }
+
+def _listing_date_label(iso: str) -> str:
+    """Turn an ISO listingDate into a Seek-style '5h ago' / '2d ago' label."""
+    try:
+        listed = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return ""
+    hours = max(0, int((datetime.now(listed.tzinfo) - listed).total_seconds() // 3600))
+    return f"{hours}h ago" if hours < 24 else f"{hours // 24}d ago"
 
-    if "30+" in t or "month" in t or "week" in t:
-        return float("inf")
+def api_job_to_card(item: dict) -> dict:
+    """
+    Map one API job to the card shape produced by CARDS_JS, plus the
+    detail fields the API already carries (used when the ad page lacks them).
+    """
+    def desc(v) -> str:
+        return (v.get("description") or "") if isinstance(v, dict) else (v or "")
+
+    sub, cls = desc(item.get("subClassification")), desc(item.get("classification"))
+    locations = item.get("locations") or []
+    location = (locations[0].get("label") or "") if locations else (item.get("location") or "")
+    work_types = item.get("workTypes") or []
+
+    return {
+        "title": (item.get("title") or "").strip(),
+        "company": (desc(item.get("advertiser")) or item.get("companyName") or "").strip(),
+        "posted": item.get("listingDateDisplay") or _listing_date_label(item.get("listingDate")),
+        "href": f"/job/{item['id']}" if item.get("id") else None,
+        "fields": {
+            "location": location,
+            "category": f"{sub} ({cls})" if sub and cls else (sub or cls),
+            "work_type": item.get("workType") or (work_types[0] if work_types else ""),
+            "salary": item.get("salary") or item.get("salaryLabel") or "",
+        },
+    }
+
+class SearchApiError(Exception):
+    """The search API is down, refused the request or answered in an unexpected shape."""
+
+async def fetch_api_cards(client, keyword: str, min_salary: int, listing_date: int, page: int):
+    """
+    Fetch one page of search results over HTTP.
+    Returns (cards, total_count); raises SearchApiError if the request fails or
+    the response is not the expected JSON. Mapping bugs are not caught here.
+    """
+    try:
+        resp = await client.get(SEEK_API_URL, params=build_seek_api_params(keyword, min_salary, listing_date, page))
+        resp.raise_for_status()
+    except httpx.HTTPError as e:
+        raise SearchApiError(f"page {page}: {e}") from e
+    try:
+        payload = resp.json()
+    except ValueError as e:
+        raise SearchApiError(f"page {page}: response is not JSON") from e
 
-    return float("inf")
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if not isinstance(data, list) or not all(isinstance(j, dict) for j in data):
+        raise SearchApiError(f"page {page}: 'data' is not a list of jobs")
+    total = payload.get("totalCount")
+    if total is not None and (isinstance(total, bool) or not isinstance(total, int) or total < 0):
+        raise SearchApiError(f"page {page}: unexpected totalCount {total!r}")
+    return [api_job_to_card(j) for j in data], total
+
+
+# ============================
+# Detail pages over plain HTTP (server-rendered HTML)
+# ============================
+class DetailBlocked(Exception):
+    """Seek answered a plain HTTP detail fetch with its bot wall (403/429)."""
+
+# innerText's "required line breaks": 2 around <p>, 1 around other block-level
+# boxes (default UA display), tab between table cells, literal newline for <br>
+_INNER_TEXT_BLOCKS = frozenset((
+    "address", "article", "aside", "blockquote", "caption", "center", "dd", "details",
+    "dialog", "dir", "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer",
+    "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hgroup", "hr", "legend",
+    "li", "listing", "main", "menu", "nav", "ol", "pre", "section", "summary",
+    "table", "tbody", "tfoot", "thead", "tr", "ul", "xmp",
+))
+# Never rendered, so never part of innerText
+_INNER_TEXT_SKIP = frozenset(("script", "style", "noscript", "template", "head", "title"))
+_RE_HTML_WS = re.compile(r"[ \t\r\n\f]+")
+# Private-use stand-ins so <pre> whitespace and cell tabs survive the collapse pass
+_PRE_SPACE, _PRE_NEWLINE, _CELL_TAB = "\ue000", "\ue001", "\ue002"
+_RE_SPACES = re.compile(r" {2,}")
+
+def _inner_text_items(node, out: list, pre: bool) -> None:
+    """Flatten node's children into text pieces and required-break counts (ints)."""
+    for child in node.iter(include_text=True):
+        tag = child.tag
+        if tag == "-text":
+            t = child.text_content or ""
+            if pre:
+                t = t.replace("\r\n", "\n").replace(" ", _PRE_SPACE).replace("\n", _PRE_NEWLINE)
+            else:
+                t = _RE_HTML_WS.sub(" ", t)
+            out.append(t)
+            continue
+        if tag.startswith("-") or tag in _INNER_TEXT_SKIP:
+            continue
+        if tag == "br":
+            out.append(_PRE_NEWLINE if pre else "\n")
+            continue
+        breaks = 2 if tag == "p" else 1 if tag in _INNER_TEXT_BLOCKS else 0
+        if breaks:
+            out.append(breaks)
+        _inner_text_items(child, out, pre or tag in ("pre", "listing", "xmp", "textarea"))
+        if tag in ("td", "th"):
+            out.append(_CELL_TAB)
+        if breaks:
+            out.append(breaks)
+
+def _inner_text(node) -> str:
+    """
+    Approximate element.innerText for a parsed node, following the spec's
+    required-line-break rules; non-rendered elements are dropped and
+    &nbsp; is kept like the browser does.
+
+    >>> t = lambda h: _inner_text(LexborHTMLParser(h).body)
+    >>> t("<script>var x=1;</script><style>.a{}</style><p>Text</p>")
+    'Text'
+    >>> t("<p>Intro</p><ul><li>One</li><li>Two</li></ul><p>Outro</p>")
+    'Intro\\n\\nOne\\nTwo\\n\\nOutro'
+    >>> t("<strong>Responsibilities:</strong><ul><li>Build</li><li>Ship</li></ul>")
+    'Responsibilities:\\nBuild\\nShip'
+    >>> t("About us<ol><li>A</li></ol>Apply now")
+    'About us\\nA\\nApply now'
+    >>> t("<section>One</section><section>Two</section>")
+    'One\\nTwo'
+    >>> t("Line1<hr>Line2")
+    'Line1\\nLine2'
+    >>> t("<table><tr><td>a</td><td>b</td></tr><tr><td>c</td></tr></table>")
+    'a\\tb\\nc'
+    >>> t("Lead <b>bold</b> <br> next <pre>  x\\n y</pre>")
+    'Lead bold\\nnext\\n  x\\n y'
+    """
+    if node is None:
+        return ""
+    items = []
+    _inner_text_items(node, items, pre=False)
+
+    # Resolve break runs: the largest count wins, leading/trailing runs vanish
+    parts = []
+    pending = 0
+    for item in items:
+        if isinstance(item, int):
+            pending = max(pending, item)
+        elif item:
+            if pending and parts:
+                parts.append("\n" * pending)
+            pending = 0
+            parts.append(item)
+    text = _RE_SPACES.sub(" ", "".join(parts))
+    # Collapsible spaces at line edges and the tab after a row's last cell go
+    text = "\n".join(line.strip(" ").rstrip(_CELL_TAB).rstrip(" ") for line in text.split("\n"))
+    text = text.strip(" \n")
+    return text.replace(_CELL_TAB, "\t").replace(_PRE_SPACE, " ").replace(_PRE_NEWLINE, "\n")
+
+def parse_detail_html(html: str) -> dict:
+    """Same fields as DETAIL_FIELDS_JS, read from the raw detail-page HTML."""
+    tree = LexborHTMLParser(html)
+    return {key: _inner_text(tree.css_first(sel)) for key, sel in DETAIL_FIELD_SELECTORS.items()}
+
+async def fetch_detail_http(client, url: str):
+    """
+    Fetch and parse one ad without a browser.
+    Returns None when the HTML has no ad body (caller falls back to a tab);
+    raises DetailBlocked on 403/429.
+    """
+    resp = await client.get(url)
+    if resp.status_code in (403, 429):
+        raise DetailBlocked(f"HTTP {resp.status_code}")
+    resp.raise_for_status()
+    fields = parse_detail_html(resp.text)
+    return fields if fields["ad_text"] else None
 
 
 # ============================
@@ -111,6 +385,25 @@ JOB_TITLE_SEL = ", ".join([
     '[data-automation="jobTitle"]',
     'a[data-testid="job-card-title"]',
 ])
+JOB_TITLE_FALLBACK_SEL = "a[role='link'], a"
+
+JOB_COMPANY_SEL = ", ".join([
+    '[data-automation="jobCompany"]',
+    '[data-testid="job-card-company"]',
+])
+
+JOB_POSTED_SEL = ", ".join([
+    '[data-automation="jobListingDate"]',
+    '[data-testid="job-card-date"]',
+])
+
+# Tried in order; the first match whose href contains /job/ wins
+DETAIL_LINK_SELECTORS = (
+    'a[data-automation="job-list-item-link-overlay"]',
+    'a:has([data-automation="jobTitle"])',
+    'a[data-testid="job-card-title"]',
+    'a[href*="/job/"]',
+)
 
 # Detail page selectors
 DETAIL_READY_SEL = ", ".join([
@@ -121,17 +414,119 @@ DETAIL_READY_SEL = ", ".join([
     '[data-testid="job-detail-view"]',
 ])
 
+DETAIL_FIELD_SELECTORS = {
+    "location": '[data-automation="job-detail-location"]',
+    "category": '[data-automation="job-detail-classifications"]',
+    "work_type": '[data-automation="job-detail-work-type"]',
+    "salary": '[data-automation="job-detail-salary"]',
+    "ad_text": '[data-automation="jobAdDetails"]',
+}
+
+# Trimmed innerText of the first match per selector ("" when missing)
+DETAIL_FIELDS_JS = """
+(sels) => Object.fromEntries(Object.entries(sels).map(
+    ([k, s]) => [k, ((document.querySelector(s) || {}).innerText || "").trim()]
+))
+"""
+
 PAGINATION_LINK_SELECTORS = [
     "a[data-automation^='page-']",
     "a[data-testid^='pagination-page-']",
     "nav[aria-label='Pagination'] a",
 ]
+PAGINATION_SEL = ", ".join(PAGINATION_LINK_SELECTORS)
+
+# Readiness predicate: any element matching the (comma-joined) selector list
+READY_JS = "sel => !!document.querySelector(sel)"
+READY_POLL_MS = 100
+# Pooled detail tabs: a stuck navigation fails fast and the job is skipped
+DETAIL_NAV_TIMEOUT_MS = 15000
+
+# Requests the scraper never reads. Stylesheets stay allowed: the posted label
+# can be rendered through CSS ::before content on list cards.
+BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+# Third-party tracker domains, matched against the request host (the domain
+# itself or any subdomain) so search URLs such as /data-analytics-jobs never match
+BLOCKED_TRACKER_HOSTS = frozenset((
+    "googletagmanager.com",
+    "google-analytics.com",
+    "doubleclick.net",
+    "segment.io",
+    "cdn.segment.com",
+    "snowplowanalytics.com",
+    "hotjar.com",
+    "hotjar.io",
+    "optimizely.com",
+    "newrelic.com",
+    "nr-data.net",
+    "datadoghq.com",
+    "browser-intake-datadoghq.com",
+    # Adobe Launch / Analytics / Audience Manager
+    "adobedtm.com",
+    "omtrdc.net",
+    "demdex.net",
+    "facebook.net",
+    "quantserve.com",
+))
+
+@functools.lru_cache(maxsize=1024)
+def _is_tracker_host(host: str) -> bool:
+    """True if host is, or is a subdomain of, one of BLOCKED_TRACKER_HOSTS."""
+    labels = host.lower().split(".")
+    return any(".".join(labels[i:]) in BLOCKED_TRACKER_HOSTS for i in range(len(labels) - 1))
+
+def _is_tracker_request(request) -> bool:
+    return _is_tracker_host(urlsplit(request.url).hostname or "")
+# Detail pages are server-rendered: the ad text is in the HTML, so styling and
+# client-side traffic can go too. Scripts are only dropped with BLOCK_DETAIL_JS.
+DETAIL_BLOCKED_RESOURCE_TYPES = ("stylesheet", "xhr", "fetch", "websocket", "eventsource")
+
+def _is_detail_request(request) -> bool:
+    """True for subresources requested by a job detail page."""
+    try:
+        return "/job/" in request.frame.url
+    except Exception:
+        # e.g. service-worker requests have no frame
+        return False
+
+# In-browser extraction of every card on a list page (one CDP round-trip).
+# Mirrors the locator fallbacks: title -> first anchor text, posted text ->
+# ::before content, detail href -> first candidate link pointing at /job/
+# (the last candidate matches any anchor in the card whose href has /job/).
+CARDS_JS = """
+(sel) => Array.from(document.querySelectorAll(sel.card)).map(c => {
+    const text = s => { const el = c.querySelector(s); return el ? (el.innerText || "").trim() : ""; };
+    const title = text(sel.title) || text(sel.titleFallback);
+    const postedEl = c.querySelector(sel.posted);
+    let posted = postedEl ? (postedEl.innerText || "").trim() : "";
+    if (!posted && postedEl) {
+        const before = getComputedStyle(postedEl, "::before").getPropertyValue("content") || "";
+        posted = before === "none" || before === "normal" ? "" : before.replace(/^"|"$/g, "");
+    }
+    let href = null;
+    for (const s of sel.links) {
+        const a = c.querySelector(s);
+        if (!a) continue;
+        const h = a.getAttribute("href") || "";
+        if (h.includes("/job/")) { href = h; break; }
+    }
+    return { title, company: text(sel.company), posted, href };
+})
+"""
+CARDS_JS_ARG = {
+    "card": JOB_CARD_SEL,
+    "title": JOB_TITLE_SEL,
+    "titleFallback": JOB_TITLE_FALLBACK_SEL,
+    "company": JOB_COMPANY_SEL,
+    "posted": JOB_POSTED_SEL,
+    "links": list(DETAIL_LINK_SELECTORS),
+}
 
 
 # ============================
 # Consent & readiness helpers
 # ============================
-def dismiss_banners(page):
+async def dismiss_banners(page):
     # Try common consent / cookie banners / close buttons
     candidates = [
         'button:has-text("Accept all")',
@@ -146,81 +541,85 @@ def dismiss_banners(page):
     for sel in candidates:
         try:
             btns = page.locator(sel)
-            if btns.count() > 0 and btns.first.is_visible():
-                btns.first.click(timeout=1000)
-                page.wait_for_timeout(300)
+            if await btns.count() > 0 and await btns.first.is_visible():
+                await btns.first.click(timeout=1000)
+                await page.wait_for_timeout(300)
         except Exception:
             pass
 
-def ensure_results_ready(
+async def ensure_results_ready(
     page,
     base_url: str,
     screenshot_tag: str = "init",
     max_tries: int = 4,
     timeout_ms: int = 45000,
     ready_selectors: str = RESULTS_READY_SEL,  # default for list page
+    settle: bool = True,
 ):
     """
-    Robust readiness: wait for DOM/network idle, dismiss banners,
-    scroll a bit, and wait for page-type-specific selectors.
+    Robust readiness: wait for page-type-specific selectors (this is the real
+    gate, so callers may navigate with wait_until="commit"), then give the
+    network a moment, dismiss banners and scroll a bit. settle=False stops at
+    the selector gate, for server-rendered pages with nothing lazy to load.
     """
     last_err = None
     for attempt in range(1, max_tries + 1):
         try:
-            page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+            # Wait for the right selector set: one in-page predicate on a fixed
+            # interval (rAF polling can stall in backgrounded pool tabs)
+            await page.wait_for_function(READY_JS, arg=ready_selectors, polling=READY_POLL_MS, timeout=timeout_ms)
+            if not settle:
+                return
             try:
-                page.wait_for_load_state("networkidle", timeout=5000)
+                await page.wait_for_load_state("networkidle", timeout=5000)
             except Exception:
                 pass
 
-            dismiss_banners(page)
+            await dismiss_banners(page)
 
             # Gentle scroll to trigger lazy loading
             for _ in range(3):
-                page.mouse.wheel(0, 2000)
-                page.wait_for_timeout(250)
-
-            # Wait for the right selector set
-            page.wait_for_selector(ready_selectors, timeout=timeout_ms, state="attached")
+                await page.mouse.wheel(0, 2000)
+                await page.wait_for_timeout(250)
             return
         except Exception as e:
             last_err = e
             if attempt < max_tries:
                 # Light nudge: reload or toggle a benign param
                 try:
-                    toggle_url = set_query_param(base_url, "page", "1")
-                    page.goto(toggle_url, wait_until="domcontentloaded")
+                    toggle_url = set_query_param_page(base_url, 1)
+                    await page.goto(toggle_url, wait_until="commit")
                 except Exception:
                     pass
-                page.wait_for_timeout(800)
+                await page.wait_for_timeout(800)
             else:
                 try:
                     fname = f"debug_seek_{screenshot_tag}_{int(time.time())}.png"
-                    page.screenshot(path=fname, full_page=True)
+                    await page.screenshot(path=fname, full_page=True)
                     print(f"🖼️ Saved debug screenshot: {fname}")
                 except Exception:
                     pass
                 raise last_err
 
 
-def max_page_from_dom(page) -> int:
+async def max_page_from_dom(page) -> int:
     nums = []
-    loc = page.locator(", ".join(PAGINATION_LINK_SELECTORS))
+    loc = page.locator(PAGINATION_SEL)
     try:
-        n = loc.count()
+        n = await loc.count()
     except Exception:
         n = 0
     for i in range(n):
         a = loc.nth(i)
         try:
             labels = [
-                a.get_attribute("data-automation") or "",
-                a.get_attribute("aria-label") or "",
+                await a.get_attribute("data-automation") or "",
+                await a.get_attribute("aria-label") or "",
             ]
-            txt = (a.inner_text() or "").strip()
+            txt = (await a.inner_text() or "").strip()
             labels.append(txt)
             for s in labels:
-                m = re.search(r"\bpage[-\s]?(\d+)\b", s, re.I)
+                m = _RE_PAGE_LABEL.search(s)
                 if m:
                     nums.append(int(m.group(1)))
                     break
@@ -232,6 +631,49 @@ def max_page_from_dom(page) -> int:
     return max(nums) if nums else 1
 
 
+# ============================
+# Browser launch
+# ============================
+# Subsystems this scraper never uses; each costs startup time, RSS or CPU on CI runners.
+# No --disable-features here: Playwright passes its own list and a second switch
+# can replace it. The sandbox is turned off via chromium_sandbox=False.
+CHROMIUM_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+
+# ============================
+# CSV output
+# ============================
+CSV_FIELDS = [
+    "Job ID",
+    "Job Title",
+    "Company",
+    "Detail URL",
+    "Posted Label",
+    "Hours Old",
+    "Posted Datetime (Local)",
+    "Location",
+    "Category",
+    "Work Type",
+    "Salary",
+    "Ad Text",
+]
+
+CSV_BUFFER_BYTES = 1024 * 1024
+CSV_FLUSH_EVERY = 10  # rows; bounds what a crash can lose without per-row flushes
+
+
 # ============================
 # Core scraper (with pagination & robustness)
 # ============================
@@ -241,227 +683,498 @@ def scrape_jobs(
     listing_date: int = 1,
     headless: bool | None = None,
     csv_path: str = "seek_jobs_24h.csv",
+    keep_rows: bool = True,
+    cfg: Config | None = None,
 ):
     """
     Scrape Seek listings (default last 24h) ACROSS ALL PAGES and write a CSV.
-    Returns list[dict] with results.
-    """
-    headless, slow_mo = resolve_headless(headless)
-
-    with sync_playwright() as p:
-        # Launch & context
-        browser = p.chromium.launch(
-            headless=headless,
-            slow_mo=slow_mo,
-            args=["--disable-blink-features=AutomationControlled"],
-        )
-        context = browser.new_context(
-            user_agent=env_str(
-                "UA",
-                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            ),
-            locale="en-AU",
-            timezone_id=env_str("TZ", "Australia/Brisbane"),
-            viewport={"width": 1280, "height": 2000},
-        )
-
-        # Optionally block heavy assets
-        if env_bool("BLOCK_MEDIA", True):
-            def _route(route):
-                r = route.request
-                if r.resource_type in ("image", "media", "font"):
-                    return route.abort()
-                return route.continue_()
-            context.route("**/*", _route)
-
-        page = context.new_page()
-
-        base_url = build_seek_url(keyword, min_salary=min_salary, listing_date=listing_date)
-        print(f"🔍 Opening: {base_url}")
-        page.goto(base_url, wait_until="domcontentloaded")
-
-        # Wait for list page
-        ensure_results_ready(page, base_url, screenshot_tag="list", ready_selectors=RESULTS_READY_SEL)
+    Returns list[dict] with results, or just the row count when keep_rows=False
+    (rows are streamed to the CSV either way; this keeps memory flat).
 
-        # Pagination count
-        last_page = max_page_from_dom(page)
-        print(f"📑 Detected {last_page} page(s)")
-
-        all_results = []
-        seen_links = set()
-
-        def scrape_current_page():
-            nonlocal all_results, seen_links
-            cards = page.locator(JOB_CARD_SEL)
-            try:
-                count = cards.count()
-            except Exception:
-                count = 0
-            if count == 0:
-                return
-
-            for i in range(count):
-                card = cards.nth(i)
-                try:
-                    card.scroll_into_view_if_needed()
-                except Exception:
-                    pass
-                time.sleep(0.05 if slow_mo == 0 else 0.0)
-
-                def safe_inner(loc):
-                    try:
-                        return loc.first.inner_text().strip()
-                    except Exception:
-                        return ""
-
-                # Title
-                title_loc = card.locator(JOB_TITLE_SEL).first
-                title = safe_inner(title_loc)
-                if not title:
-                    title = safe_inner(card.locator("a[role='link'], a"))
+    Sync entry point; the scrape itself runs on asyncio so detail pages can
+    load concurrently (see HTTP_CONCURRENCY / TAB_POOL). Tuning knobs come
+    from cfg, defaulting to the env snapshot taken by load_cfg().
+    """
+    return asyncio.run(_scrape_jobs_async(
+        keyword=keyword,
+        min_salary=min_salary,
+        listing_date=listing_date,
+        headless=headless,
+        csv_path=csv_path,
+        keep_rows=keep_rows,
+        cfg=cfg if cfg is not None else load_cfg(),
+    ))
+
+
+async def _scrape_jobs_async(
+    keyword: str,
+    min_salary: int,
+    listing_date: int,
+    headless: bool | None,
+    csv_path: str,
+    keep_rows: bool,
+    cfg: Config,
+):
+    headless, slow_mo = resolve_headless(headless, cfg)
+    tab_pool = cfg.tab_pool
+    http_concurrency = cfg.http_concurrency
+    list_concurrency = cfg.list_concurrency
+
+    user_agent = cfg.ua
+    # HTTP/2: concurrent requests to www.seek.com.au share one multiplexed
+    # connection (one TLS handshake, HPACK-compressed repeat headers). The
+    # connection cap only matters if the server ever negotiates HTTP/1.1.
+    client = httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": user_agent, "Accept-Encoding": "gzip, br"},
+        timeout=20,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=10),
+    )
 
-                company = safe_inner(card.locator('[data-automation="jobCompany"], [data-testid="job-card-company"]'))
+    async with async_playwright() as p, client:
+        # Chromium is only launched when something needs a real page: the DOM
+        # list fallback, or detail pages the plain HTTP fetch could not read
+        browser = None
+        context = None
+        launch_lock = asyncio.Lock()
+
+        async def get_context():
+            nonlocal browser, context
+            async with launch_lock:
+                if context is not None:
+                    return context
+
+                # Launch & context
+                launch_opts = dict(
+                    headless=headless,
+                    slow_mo=slow_mo,
+                    args=CHROMIUM_ARGS,
+                    chromium_sandbox=False,
+                    handle_sigint=False,
+                )
+                context_opts = dict(
+                    user_agent=user_agent,
+                    locale="en-AU",
+                    timezone_id=cfg.tz,
+                    viewport={"width": 1280, "height": 2000},
+                )
+                # PW_USER_DATA (e.g. ./.pw-profile) keeps cookies, consent state and the
+                # disk cache between runs; one profile dir can only be used by one run at a time
+                if cfg.user_data_dir:
+                    context = await p.chromium.launch_persistent_context(cfg.user_data_dir, **launch_opts, **context_opts)
+                else:
+                    browser = await p.chromium.launch(**launch_opts)
+                    context = await browser.new_context(**context_opts)
+
+                # Optionally block heavy assets, third-party trackers and detail-page extras
+                block_media = cfg.block_media
+                block_trackers = cfg.block_trackers
+                block_detail_extras = cfg.block_detail_extras
+                block_detail_js = cfg.block_detail_js
+                if block_media or block_trackers or block_detail_extras or block_detail_js:
+                    async def _route(route):
+                        r = route.request
+                        if block_media and r.resource_type in BLOCKED_RESOURCE_TYPES:
+                            return await route.abort()
+                        if block_trackers and _is_tracker_request(r):
+                            return await route.abort()
+                        if (block_detail_extras or block_detail_js) and _is_detail_request(r):
+                            if block_detail_extras and r.resource_type in DETAIL_BLOCKED_RESOURCE_TYPES:
+                                return await route.abort()
+                            if block_detail_js and r.resource_type == "script":
+                                return await route.abort()
+                        return await route.continue_()
+                    await context.route("**/*", _route)
+                return context
 
-                # Posted label -> filter to <=24h
-                posted_el = card.locator('[data-automation="jobListingDate"], [data-testid="job-card-date"]').first
-                posted_text = safe_inner(posted_el)
-                if not posted_text and posted_el.count() > 0:
-                    try:
-                        posted_text = posted_el.evaluate(
-                            "el => window.getComputedStyle(el, '::before').getPropertyValue('content')"
-                        ).strip('"')
-                    except Exception:
-                        posted_text = ""
+        base_url = build_seek_url(keyword, min_salary=min_salary, listing_date=listing_date)
 
+        jobs = []
+        # Dedupe on the Seek job id: the same ad shows up with different
+        # tracking query strings; the full URL is only the key when no id parses
+        seen_keys = set()
+        # One reference time per run; posted times are truncated to the hour anyway
+        now_local = datetime.now().astimezone()
+        # Progress-log timestamps for the whole-hour ages a 24h scan produces, formatted once
+        posted_log_fmt = "%Y-%m-%d %H:00 %Z"
+        posted_log_by_hour = [
+            (now_local - timedelta(hours=h)).replace(minute=0, second=0, microsecond=0).strftime(posted_log_fmt)
+            for h in range(25)
+        ]
+
+        # Cards are re-checked against the same window Seek filtered on
+        # (daterange is in days, 0 = any time): a safety net for stragglers only
+        window_hours = listing_date * 24.0 if listing_date > 0 else math.inf
+        window_label = "24h" if listing_date == 1 else f"{listing_date} days"
+
+        # Results sorted newest-first within a window: a run of cards clearly
+        # older than it means the rest of the list is too. Requiring a short
+        # run (carried across pages) rides out the odd out-of-order card.
+        stop_when_stale = math.isfinite(window_hours) and "sortmode=ListedDate" in base_url
+        stale_run_to_stop = 3
+        stale_run = 0
+
+        def collect_cards(cards) -> bool:
+            """Filter/dedupe list cards into `jobs`; True once the listing window is exhausted."""
+            nonlocal stale_run
+            for card in cards:
+                title = card["title"]
+                company = card["company"]
+
+                # Posted label -> hours old (for the CSV) and the window check
+                posted_text = card["posted"]
                 hours_old = posted_text_to_hours(posted_text)
-                if hours_old > 24:
+                if hours_old > window_hours:
+                    # Unparseable labels come back as inf; only a real age counts towards the stop
+                    if stop_when_stale and math.isfinite(hours_old):
+                        stale_run += 1
+                        if stale_run >= stale_run_to_stop:
+                            return True
                     continue
+                stale_run = 0
 
-                now_local = datetime.now().astimezone()
-                posted_dt_local = (now_local - timedelta(hours=hours_old)).replace(minute=0, second=0, microsecond=0)
-                posted_dt_local_str = posted_dt_local.strftime("%Y-%m-%d %H:00 %Z")
+                # Only reachable with an unbounded window (listing_date=0): an
+                # unparseable label is an unknown age, kept with blank time columns
+                if math.isfinite(hours_old):
+                    posted_dt_local = (now_local - timedelta(hours=hours_old)).replace(minute=0, second=0, microsecond=0)
+                else:
+                    posted_dt_local = None
 
                 # Detail link
-                href = None
-                for sel in [
-                    'a[data-automation="job-list-item-link-overlay"]',
-                    'a:has([data-automation="jobTitle"])',
-                    'a[data-testid="job-card-title"]',
-                    "a",
-                ]:
-                    link = card.locator(sel).first
-                    if link.count() > 0:
-                        h = link.get_attribute("href") or ""
-                        if "/job/" in h:
-                            href = h
-                            break
+                href = card["href"]
                 if not href:
                     print(f"⚠️ No detail link for: {title} | {company}")
                     continue
 
-                detail_url = urljoin("https://www.seek.com.au", href)
-                if detail_url in seen_links:
+                # Card hrefs are site-relative paths (or already absolute); plain
+                # concatenation, with the leading slash added if it is missing
+                detail_url = href if href.startswith("http") else SEEK_BASE + (href if href.startswith("/") else "/" + href)
+                job_id = extract_job_id_from_url(detail_url)
+                key = job_id or detail_url
+                if key in seen_keys:
                     continue
-                seen_links.add(detail_url)
+                seen_keys.add(key)
+
+                jobs.append({
+                    "job_id": job_id,
+                    "title": title,
+                    "company": company,
+                    "posted_text": posted_text,
+                    "hours_old": hours_old,
+                    "posted_dt_local": posted_dt_local,
+                    "detail_url": detail_url,
+                    "fields": card.get("fields") or {},
+                })
+            return False
+
+        async def api_list_phase() -> bool:
+            """List phase over Seek's search JSON API; False if the API is unusable."""
+            async def fetch_page(pageno):
+                print(f"🔌 Search API page {pageno}")
+                cards, _ = await fetch_api_cards(client, keyword, min_salary, listing_date, pageno)
+                return cards
+
+            # Only SearchApiError (fetch, JSON or payload shape) means "use the
+            # results page instead"; a bug in card processing is not an API
+            # outage and is left to surface
+            def api_unavailable(e) -> bool:
+                nonlocal stale_run
+                print(f"⚠️ Search API unavailable, falling back to the results page ({e})")
+                jobs.clear()
+                seen_keys.clear()
+                stale_run = 0
+                return False
+
+            print("🔌 Search API page 1")
+            try:
+                cards, total = await fetch_api_cards(client, keyword, min_salary, listing_date, 1)
+            except SearchApiError as e:
+                return api_unavailable(e)
+            print(f"📑 API reports {total} listing(s)")
+            if not cards or collect_cards(cards):
+                return True
+            # Page size comes from the first page; without a total, keep going until a page is empty
+            last_page = math.ceil(total / len(cards)) if total is not None else None
+
+            # Remaining pages in concurrent batches, consumed in page order so
+            # the stale-listing cut-off still applies
+            pageno = 2
+            while last_page is None or pageno <= last_page:
+                stop = pageno + list_concurrency
+                if last_page is not None:
+                    stop = min(stop, last_page + 1)
+                # A failed page is skipped, as in the DOM path. Without a known
+                # page count, a batch in which every page failed ends the scan
+                # (keeping what we have) instead of probing pages forever.
+                batch = await asyncio.gather(*(fetch_page(n) for n in range(pageno, stop)), return_exceptions=True)
+                failed = 0
+                for n, cards in zip(range(pageno, stop), batch):
+                    if isinstance(cards, BaseException):
+                        if not isinstance(cards, SearchApiError):
+                            raise cards
+                        print(f"⚠️ Skipping API page {n} ({cards})")
+                        failed += 1
+                        continue
+                    if not cards or collect_cards(cards):
+                        return True
+                if last_page is None and failed == len(batch):
+                    print(f"⚠️ Search API stopped answering at page {pageno}; keeping {len(jobs)} listing(s)")
+                    return True
+                pageno = stop
+            return True
+
+        async def read_cards(page) -> list:
+            """Card metadata for the list page loaded in `page`; details are fetched later."""
+            # One jump to the bottom triggers any lazy-loaded cards before the batch read
+            try:
+                await page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+                await page.wait_for_load_state("networkidle", timeout=3000)
+            except Exception:
+                pass
 
-                job_id = extract_job_id_from_url(detail_url)
+            try:
+                return await page.evaluate(CARDS_JS, CARDS_JS_ARG)
+            except Exception:
+                return []
 
-                # Open detail
-                detail_page = context.new_page()
+        async def load_list_page(pageno: int, page_url: str, last_page: int) -> list:
+            """Open one results page in its own tab and read its cards."""
+            page = await (await get_context()).new_page()
+            try:
+                print(f"📄 Page {pageno}/{last_page} → {page_url}")
+                await page.goto(page_url, wait_until="commit")
                 try:
-                    print(f"➡️  {title} | {company} | {posted_text} → {posted_dt_local_str} | {detail_url}")
-                    detail_page.goto(detail_url, wait_until="domcontentloaded")
-
-                    # Wait using DETAIL selectors
-                    try:
-                        ensure_results_ready(
-                            detail_page,
-                            detail_url,
-                            screenshot_tag=f"detail_{job_id or 'unknown'}",
-                            timeout_ms=30000,
-                            ready_selectors=DETAIL_READY_SEL,
-                        )
-                    except Exception as e:
-                        # Last fallback: look for a generic main/article to avoid false negatives
-                        try:
-                            detail_page.wait_for_selector("main, article", timeout=4000)
-                        except Exception:
-                            print(f"⏭️  Skipping (ready failed): {detail_url} ({e})")
-                            return
-
-                    def safe_text(pg, selector: str, default: str = ""):
-                        loc = pg.locator(selector)
-                        try:
-                            return loc.first.inner_text().strip() if loc.count() > 0 else default
-                        except Exception:
-                            return default
-
-                    # Extract fields
-                    location = safe_text(detail_page, '[data-automation="job-detail-location"]')
-                    category = safe_text(detail_page, '[data-automation="job-detail-classifications"]')
-                    work_type = safe_text(detail_page, '[data-automation="job-detail-work-type"]')
-                    salary = safe_text(detail_page, '[data-automation="job-detail-salary"]')
-
-                    ad_loc = detail_page.locator('[data-automation="jobAdDetails"]').first
-                    try:
-                        ad_text = ad_loc.inner_text().strip() if ad_loc.count() > 0 else ""
-                    except Exception:
-                        ad_text = ""
-
-                    all_results.append({
-                        "Job ID": job_id,
-                        "Job Title": title,
-                        "Company": company,
-                        "Detail URL": detail_url,
-                        "Posted Label": posted_text,
-                        "Hours Old": round(hours_old, 2),
-                        "Posted Datetime (Local)": posted_dt_local.isoformat(),
-                        "Location": location,
-                        "Category": category,
-                        "Work Type": work_type,
-                        "Salary": salary,
-                        "Ad Text": ad_text
-                    })
-
-                finally:
+                    await ensure_results_ready(page, page_url, screenshot_tag=f"list_p{pageno}", ready_selectors=RESULTS_READY_SEL)
+                except Exception:
                     try:
-                        detail_page.close()
+                        await page.mouse.wheel(0, 1500)
+                        await page.wait_for_timeout(500)
                     except Exception:
                         pass
+                return await read_cards(page)
+            finally:
+                await page.close()
+
+        async def dom_list_phase():
+            """List phase over the rendered results pages (fallback when the API is unusable)."""
+            page = await (await get_context()).new_page()
+            print(f"🔍 Opening: {base_url}")
+            await page.goto(base_url, wait_until="commit")
+
+            # Wait for list page
+            await ensure_results_ready(page, base_url, screenshot_tag="list", ready_selectors=RESULTS_READY_SEL)
+
+            # Pagination count
+            last_page = await max_page_from_dom(page)
+            print(f"📑 Detected {last_page} page(s)")
+
+            # First page
+            exhausted = collect_cards(await read_cards(page))
+            await page.close()
+
+            # Remaining pages: up to LIST_CONCURRENCY tabs at a time, consumed in
+            # page order so a stale page still stops everything after it
+            if exhausted and last_page > 1:
+                print(f"⏹️  Reached listings older than {window_label}; skipping remaining pages")
+            elif last_page > 1:
+                page_urls = [(n, set_query_param_page(base_url, n)) for n in range(2, last_page + 1)]
+                for start in range(0, len(page_urls), list_concurrency):
+                    batch = page_urls[start:start + list_concurrency]
+                    results = await asyncio.gather(
+                        *(load_list_page(n, u, last_page) for n, u in batch),
+                        return_exceptions=True,
+                    )
+                    for (pageno, page_url), cards in zip(batch, results):
+                        if isinstance(cards, Exception):
+                            print(f"⚠️ Skipping list page {pageno} ({cards})")
+                            continue
+                        if collect_cards(cards):
+                            exhausted = True
+                            break
+                    if exhausted:
+                        print(f"⏹️  Reached listings older than {window_label}; skipping remaining pages")
+                        break
 
-        # First page
-        scrape_current_page()
+        if not (cfg.use_api and await api_list_phase()):
+            await dom_list_phase()
 
-        # Remaining pages
-        if last_page > 1:
-            for pageno in range(2, last_page + 1):
-                page_url = set_query_param(base_url, "page", str(pageno))
-                print(f"📄 Page {pageno}/{last_page} → {page_url}")
-                page.goto(page_url, wait_until="domcontentloaded")
+        async def fetch_detail_browser(detail_page, job):
+            """Detail fields from a real tab; None if the page never becomes ready."""
+            detail_url = job["detail_url"]
+            await detail_page.goto(detail_url, wait_until="commit")
+
+            # Wait using DETAIL selectors
+            try:
+                await ensure_results_ready(
+                    detail_page,
+                    detail_url,
+                    screenshot_tag=f"detail_{job['job_id'] or 'unknown'}",
+                    # A stuck ad only holds one pool tab, but 4 x 30s would
+                    # still stall the tail of the run; give up sooner
+                    max_tries=2,
+                    timeout_ms=20000,
+                    ready_selectors=DETAIL_READY_SEL,
+                    # The ad is in the server-rendered HTML: no lazy cards to
+                    # scroll in, and a banner over it does not hide innerText
+                    settle=False,
+                )
+            except Exception as e:
+                # Last fallback: look for a generic main/article to avoid false negatives
                 try:
-                    ensure_results_ready(page, page_url, screenshot_tag=f"list_p{pageno}", ready_selectors=RESULTS_READY_SEL)
+                    await detail_page.wait_for_function(READY_JS, arg="main, article", polling=READY_POLL_MS, timeout=4000)
                 except Exception:
+                    print(f"⏭️  Skipping (ready failed): {detail_url} ({e})")
+                    return None
+
+            # Extract fields (one round-trip for all of them)
+            try:
+                return await detail_page.evaluate(DETAIL_FIELDS_JS, DETAIL_FIELD_SELECTORS)
+            except Exception:
+                return {}
+
+        def build_row(job, fields):
+            # Search API values fill in anything the detail page did not render
+            api_fields = job["fields"]
+            return {
+                "Job ID": job["job_id"],
+                "Job Title": job["title"],
+                "Company": job["company"],
+                "Detail URL": job["detail_url"],
+                "Posted Label": job["posted_text"],
+                "Hours Old": round(job["hours_old"], 2) if job["posted_dt_local"] is not None else "",
+                "Posted Datetime (Local)": job["posted_dt_local"].isoformat() if job["posted_dt_local"] is not None else "",
+                "Location": fields.get("location") or api_fields.get("location", ""),
+                "Category": fields.get("category") or api_fields.get("category", ""),
+                "Work Type": fields.get("work_type") or api_fields.get("work_type", ""),
+                "Salary": fields.get("salary") or api_fields.get("salary", ""),
+                "Ad Text": fields.get("ad_text", ""),
+            }
+
+        # Detail phase: HTTP_CONCURRENCY workers drain a shared queue. Each ad is
+        # first fetched as plain HTML (server-rendered, no browser needed); only
+        # when Seek refuses that or the ad body is missing does the worker
+        # borrow a tab from a pool of at most TAB_POOL, opened on first use
+        # and reused afterwards.
+        # Rows are streamed to the CSV in listing order (newest first): each job
+        # is numbered when queued, and a finished row waits in `pending` until
+        # every job before it is done.
+        queue = asyncio.Queue()
+        for idx, job in enumerate(jobs):
+            queue.put_nowait((idx, job))
+        all_results = []
+        rows_written = 0
+        http_blocked = False
+        pending = {}
+        next_idx = 0
+
+        tab_slots = asyncio.Semaphore(tab_pool)
+        idle_tabs = []
+        all_tabs = []
+
+        async def acquire_tab():
+            await tab_slots.acquire()
+            if idle_tabs:
+                return idle_tabs.pop()
+            try:
+                tab = await (await get_context()).new_page()
+            except Exception:
+                tab_slots.release()
+                raise
+            tab.set_default_navigation_timeout(DETAIL_NAV_TIMEOUT_MS)
+            all_tabs.append(tab)
+            return tab
+
+        def release_tab(tab):
+            idle_tabs.append(tab)
+            tab_slots.release()
+
+        # Block-buffered: flushed every CSV_FLUSH_EVERY rows, close() drains the rest
+        with open(csv_path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_BYTES) as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, lineterminator="\n")
+            writer.writeheader()
+
+            def emit(idx, row):
+                """Record a finished job (row=None when skipped); write whatever is now in order."""
+                nonlocal rows_written, next_idx
+                pending[idx] = row
+                while next_idx in pending:
+                    ready = pending.pop(next_idx)
+                    next_idx += 1
+                    if ready is None:
+                        continue
+                    writer.writerow(ready)
+                    rows_written += 1
+                    # Periodic flush so a crashed run still leaves rows on disk
+                    if rows_written % CSV_FLUSH_EVERY == 0:
+                        f.flush()
+                    if keep_rows:
+                        all_results.append(ready)
+
+            async def detail_worker():
+                nonlocal http_blocked
+                while True:
                     try:
-                        page.mouse.wheel(0, 1500)
-                        page.wait_for_timeout(500)
-                    except Exception:
-                        pass
-                scrape_current_page()
+                        idx, job = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    detail_url = job["detail_url"]
+                    hours_old = job["hours_old"]
+                    if job["posted_dt_local"] is None:
+                        posted_dt_local_str = "unknown age"
+                    elif hours_old.is_integer() and 0 <= hours_old <= 24:
+                        posted_dt_local_str = posted_log_by_hour[int(hours_old)]
+                    else:
+                        posted_dt_local_str = job["posted_dt_local"].strftime(posted_log_fmt)
+                    print(f"➡️  {job['title']} | {job['company']} | {job['posted_text']} → {posted_dt_local_str} | {detail_url}")
+                    try:
+                        fields = None
+                        if not http_blocked:
+                            try:
+                                fields = await fetch_detail_http(client, detail_url)
+                            except DetailBlocked as e:
+                                # Bot wall: stop hammering it, go through the browser from now on
+                                if not http_blocked:
+                                    print(f"🧱 Plain HTTP refused ({e}); using browser tabs for detail pages")
+                                http_blocked = True
+                            except Exception as e:
+                                print(f"⚠️ Plain HTTP failed for {detail_url} ({e}); retrying in a tab")
+                        if fields is None:
+                            tab = await acquire_tab()
+                            try:
+                                fields = await fetch_detail_browser(tab, job)
+                            finally:
+                                release_tab(tab)
+                    except Exception as e:
+                        print(f"⏭️  Skipping (detail failed): {detail_url} ({e})")
+                        fields = None
+                    emit(idx, build_row(job, fields) if fields is not None else None)
 
-        # Close & write
-        context.close()
-        browser.close()
+            if jobs:
+                workers = min(http_concurrency, len(jobs))
+                print(f"🗂️  Fetching {len(jobs)} detail page(s) with {workers} worker(s)")
+                await asyncio.gather(*(detail_worker() for _ in range(workers)))
+
+        for tab in all_tabs:
+            try:
+                await tab.close()
+            except Exception:
+                pass
 
-        df = pd.DataFrame(all_results)
-        df.to_csv(csv_path, index=False)
-        print(f"✅ Scraped {len(all_results)} job(s). CSV written: {csv_path}")
-        return all_results
+        # Close
+        if context is not None:
+            await context.close()
+        if browser is not None:
+            await browser.close()
+
+        print(f"✅ Scraped {rows_written} job(s). CSV written: {csv_path}")
+        return all_results if keep_rows else rows_written
 
 
 # ============================
 # Headless mode resolver
 # ============================
-def resolve_headless(headless_param: bool | None) -> tuple[bool, float]:
+def resolve_headless(headless_param: bool | None, cfg: Config | None = None) -> tuple[bool, float]:
     """
     Decide headless mode:
       - If HEADLESS env is set, use it.
@@ -470,22 +1183,21 @@ def resolve_headless(headless_param: bool | None) -> tuple[bool, float]:
       - Else default headless True.
     Also returns slow_mo (seconds) from env SLOW_MO (only applied when headed).
     """
-    if os.getenv("HEADLESS") not in (None, ""):
-        headless = env_bool("HEADLESS", True)
+    cfg = cfg if cfg is not None else load_cfg()
+    if cfg.headless is not None:
+        headless = cfg.headless
     elif headless_param is not None:
         headless = headless_param
     else:
-        in_ci = env_bool("CI", False)
-        has_display = os.getenv("DISPLAY") not in (None, "")
-        if in_ci and not has_display:
+        if cfg.ci and not cfg.has_display:
             headless = True
-        elif has_display:
+        elif cfg.has_display:
             headless = False
         else:
             headless = True
 
-    slow_mo = float(env_str("SLOW_MO", "0"))
-    if headless or env_bool("CI", False):
+    slow_mo = cfg.slow_mo
+    if headless or cfg.ci:
         slow_mo = 0.0
     return headless, slow_mo
 
@@ -493,22 +1205,18 @@ def resolve_headless(headless_param: bool | None) -> tuple[bool, float]:
 # ============================
 # CLI
 # ============================
-if __name__ == "__main__":
-    kw = env_str("KEYWORD", "Senior Insight Analyst")
-    min_sal = env_int("MIN_SALARY", 150000)
-    ldate = env_int("LISTING_DATE", 1)
-    csv_out = env_str("CSV_PATH", "seek_jobs_24h.csv")
-
-    headless_env = os.getenv("HEADLESS")
-    if headless_env is not None and headless_env.strip() != "":
-        headless_val = env_bool("HEADLESS", True)
-    else:
-        headless_val = None  # delegate to resolve_headless()
-
+def main():
+    cfg = load_cfg()
     scrape_jobs(
-        keyword=kw,
-        min_salary=min_sal,
-        listing_date=ldate,
-        headless=headless_val,
-        csv_path=csv_out,
+        keyword=cfg.keyword,
+        min_salary=cfg.min_salary,
+        listing_date=cfg.listing_date,
+        headless=cfg.headless,  # None delegates to resolve_headless()
+        csv_path=cfg.csv_path,
+        keep_rows=False,
+        cfg=cfg,
     )
+
+
+if __name__ == "__main__":
+    main()